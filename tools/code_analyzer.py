@@ -6,11 +6,63 @@ This script analyzes the codebase for potential issues, coding style
 violations, and provides metrics about the code.
 """
 
+import bisect
+import heapq
+import json
+import mmap
 import os
 import re
 import sys
 import subprocess
+from array import array
 from collections import defaultdict, Counter
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from functools import lru_cache
+
+# libclang is optional; without it functions are found with a regex
+try:
+    import clang.cindex
+except ImportError:
+    clang = None
+
+# Files are analyzed through a read-only mmap of their bytes, so every
+# pattern is a bytes pattern. mmap has no count() and its `in` operator does
+# not search for substrings, so the checks use find() and regexes instead.
+#
+# Patterns that do not overlap are merged into a single alternation so that
+# each file is scanned once; matches are told apart by their group name.
+_SCAN_PATTERNS = [
+    ('func', r'(?:\w+\s+)*(?P<func_type>\w+)\s+(?P<func_name>\w+)\s*\([^)]*\)\s*\{'),
+    ('define', r'#define\s+(?P<define_name>[A-Za-z0-9_]+)'),
+    ('malloc', r'(?P<malloc_var>\w+)\s*=\s*malloc\('),
+    ('free', r'free\s*\(\s*(?P<free_var>\w+)\s*\)'),
+]
+_COMBINED_RE = re.compile('|'.join(f'(?P<{name}>{pattern})' for name, pattern in _SCAN_PATTERNS).encode())
+# Used when libclang finds the functions instead
+_COMBINED_NO_FUNC_RE = re.compile('|'.join(f'(?P<{name}>{pattern})' for name, pattern in _SCAN_PATTERNS
+                                           if name != 'func').encode())
+
+# Precompiled patterns
+_NEWLINE_RE = re.compile(rb'\n')
+_BRACE_RE = re.compile(rb'[{}]')
+_TODO_RE = re.compile(rb'(TODO|FIXME|XXX)', re.IGNORECASE)
+_SNAKE_RE = re.compile(rb'^[a-z][a-z0-9_]*$')
+_UPPER_RE = re.compile(rb'^[A-Z][A-Z0-9_]*$')
+# Matched right after a malloc statement: `if (!var` or `if (var == NULL`
+_CHECKED_RE = re.compile(rb'\s*if\s*\(\s*(?:!\s*(\w+)|(\w+)\s*==\s*NULL)')
+# Cheap prefilter: a file without any of these names cannot match a syscall
+# pattern (no trailing \b, since the patterns also match e.g. 'readdir')
+_SYSCALL_ANY_RE = re.compile(rb'\b(?:open|close|read|write|fork|exec|dup)')
+# One alternation for all checked calls; dup2 comes first so it is not reported as dup
+_SYSCALL_RE = re.compile(rb'(\w+)\s*=\s*(open|close|read|write|fork|exec|dup2|dup)[^;]*;(?!\s*if\s*\(\s*\1)')
+_VAR_RE = re.compile(rb'(int|char|float|double|long|short|unsigned|void|bool|size_t)\s+([a-zA-Z_][a-zA-Z0-9_]*)[^(]')
+
+# Results of earlier runs, keyed by the absolute path of each file
+_CACHE_PATH = os.path.join(os.environ.get('XDG_CACHE_HOME') or os.path.expanduser('~/.cache'),
+                           'c_shell_analyzer.json')
+# Bump whenever a change to the checks makes cached results stale
+_CACHE_VERSION = 2
 
 # ANSI colors
 class Colors:
@@ -36,229 +88,343 @@ def print_issue(severity, message, file=None, line=None):
 def find_c_files(directory):
     """Find all C source and header files in the directory."""
     c_files = []
-    for root, _, files in os.walk(directory):
-        for file in files:
-            if file.endswith(('.c', '.h')):
-                c_files.append(os.path.join(root, file))
+    # scandir reports entry types without an extra stat() per entry
+    stack = [directory]
+    while stack:
+        subdirs = []
+        try:
+            with os.scandir(stack.pop()) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        subdirs.append(entry.path)
+                    elif entry.name.endswith(('.c', '.h')):
+                        c_files.append(entry.path)
+        except OSError:
+            # Unreadable directories are skipped, as os.walk does
+            continue
+        # Pushed in reverse so subdirectories are visited in listing order,
+        # top-down like os.walk
+        stack.extend(reversed(subdirs))
     return c_files
 
-def check_file_length(file_path):
-    """Check if a file is too long."""
-    with open(file_path, 'r') as f:
-        lines = f.readlines()
-    
-    if len(lines) > 500:
-        print_issue("WARNING", f"File is too long ({len(lines)} lines)", file_path)
+@contextmanager
+def map_file(file_path):
+    """Map a file read-only; empty files cannot be mapped and yield b''."""
+    with open(file_path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            yield b''
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as content:
+            yield content
+
+def line_offsets(content):
+    """Return the sorted offsets of every newline in the content.
     
-    return len(lines)
+    An int64 array takes 8 bytes per line, far less than a list of ints.
+    """
+    return array('q', (match.start() for match in _NEWLINE_RE.finditer(content)))
 
-def check_function_length(file_path):
-    """Check for functions that are too long."""
-    with open(file_path, 'r') as f:
-        content = f.read()
+def count_lines(content, newlines):
+    """Count lines, including a last line without a trailing newline."""
+    last_start = newlines[-1] + 1 if newlines else 0
+    return len(newlines) + (last_start < len(content))
+
+def iter_lines(content, newlines):
+    """Yield each line of the content without its line ending."""
+    start = 0
+    for end in newlines:
+        yield content[start:end].rstrip(b'\r')
+        start = end + 1
+    if start < len(content):
+        yield content[start:]
+
+def line_of(newlines, pos):
+    """Translate a content offset into a 1-based line number."""
+    return bisect.bisect_left(newlines, pos) + 1
+
+def scan_file(content, pattern=_COMBINED_RE):
+    """Scan the content once, grouping matches by the pattern that produced them."""
+    matches = defaultdict(list)
+    for match in pattern.finditer(content):
+        matches[match.lastgroup].append(match)
+    return matches
+
+def check_file_length(file_path, line_count, report):
+    """Check if a file is too long."""
+    if line_count > 500:
+        report("WARNING", f"File is too long ({line_count} lines)", file_path)
     
-    # Simple regex to find function definitions
-    function_pattern = r'(\w+\s+)+(\w+)\s*\([^)]*\)\s*\{'
+    return line_count
+
+def match_braces(content):
+    """Map the offset of every '{' to the offset just past its matching '}'.
+    
+    All braces are matched in one pass, so finding the end of each function
+    is a lookup rather than a walk over its body.
+    """
+    brace_ends = {}
+    open_braces = []
+    for match in _BRACE_RE.finditer(content):
+        if match.group() == b'{':
+            open_braces.append(match.start())
+        elif open_braces:
+            brace_ends[open_braces.pop()] = match.end()
+    return brace_ends
+
+def find_functions(content, newlines, func_matches):
+    """Find function definitions from the regex scan.
     
+    Returns (name, declaration line, body line, body length) tuples.
+    """
     functions = []
-    current_pos = 0
+    brace_ends = match_braces(content)
     
-    for match in re.finditer(function_pattern, content):
-        func_name = match.group(2)
+    for match in func_matches:
         start_pos = match.end()
         
-        # Find the end of the function (matching curly brace)
-        brace_count = 1
-        end_pos = start_pos
-        
-        while brace_count > 0 and end_pos < len(content):
-            if content[end_pos] == '{':
-                brace_count += 1
-            elif content[end_pos] == '}':
-                brace_count -= 1
-            end_pos += 1
+        # Find the end of the function (matching curly brace); the match
+        # ends with the opening brace, and an unclosed one runs to the end
+        end_pos = brace_ends.get(start_pos - 1, len(content))
         
-        func_content = content[start_pos:end_pos]
-        func_lines = func_content.count('\n') + 1
-        
-        functions.append((func_name, func_lines))
+        # Newlines in the body, counted from the offset table without
+        # copying the body out of the file
+        body_line = line_of(newlines, start_pos)
+        func_lines = line_of(newlines, end_pos) - body_line + 1
         
+        functions.append((match.group('func_name'), line_of(newlines, match.start('func_type')),
+                          body_line, func_lines))
+    
+    return functions
+
+@lru_cache(maxsize=None)
+def clang_index():
+    """Return this process's libclang index, or None if libclang is unusable."""
+    if clang is None:
+        return None
+    try:
+        return clang.cindex.Index.create()
+    except clang.cindex.LibclangError:
+        return None
+
+def parse_functions(file_path):
+    """Find function definitions with libclang if it is available.
+    
+    Returns the same tuples as find_functions(), or None without libclang.
+    """
+    index = clang_index()
+    if index is None:
+        return None
+    try:
+        tu = index.parse(file_path)
+    except clang.cindex.TranslationUnitLoadError:
+        return None
+    
+    functions = []
+    for cursor in tu.cursor.get_children():
+        if (cursor.kind != clang.cindex.CursorKind.FUNCTION_DECL or not cursor.is_definition()
+                or cursor.location.file is None or cursor.location.file.name != file_path):
+            continue
+        body = next((child for child in cursor.get_children()
+                     if child.kind == clang.cindex.CursorKind.COMPOUND_STMT), None)
+        if body is None:
+            continue
+        functions.append((cursor.spelling.encode(), cursor.extent.start.line, body.extent.start.line,
+                          body.extent.end.line - body.extent.start.line + 1))
+    return functions
+
+def check_function_length(file_path, functions, report):
+    """Check for functions that are too long."""
+    for func_name, _, body_line, func_lines in functions:
         if func_lines > 50:
-            # Find approximate line number
-            line_num = content[:start_pos].count('\n') + 1
-            print_issue("WARNING", f"Function '{func_name}' is too long ({func_lines} lines)", file_path, line_num)
+            report("WARNING", f"Function '{func_name.decode()}' is too long ({func_lines} lines)", file_path, body_line)
     
     return functions
 
-def check_long_lines(file_path):
-    """Check for lines longer than 80 characters."""
-    long_lines = []
-    with open(file_path, 'r') as f:
-        for i, line in enumerate(f, 1):
-            if len(line.rstrip('\n')) > 80:
-                long_lines.append(i)
-                print_issue("WARNING", f"Line exceeds 80 characters ({len(line.rstrip())})", file_path, i)
-    
-    return long_lines
-
-def check_todo_comments(file_path):
-    """Find TODO comments."""
-    todos = []
-    with open(file_path, 'r') as f:
-        for i, line in enumerate(f, 1):
-            if re.search(r'(TODO|FIXME|XXX)', line, re.IGNORECASE):
-                todos.append((i, line.strip()))
-                print_issue("INFO", f"Found TODO comment: '{line.strip()}'", file_path, i)
-    
-    return todos
-
-def check_naming_conventions(file_path):
+def scan_lines(file_path, lines, report):
+    """Check each line for excessive length and TODO comments in one pass.
+    
+    The same pass counts total, blank and comment lines (simplistic
+    approach) for collect_metrics().
+    """
+    total_lines = comment_lines = blank_lines = 0
+    for total_lines, line in enumerate(lines, 1):
+        # The byte length is never below the character length, so it is a
+        # cheap prefilter before decoding
+        if len(line) > 80:
+            text = line.decode('utf-8', 'replace')
+            if len(text) > 80:
+                report("WARNING", f"Line exceeds 80 characters ({len(text.rstrip())})", file_path, total_lines)
+        if _TODO_RE.search(line):
+            report("INFO", f"Found TODO comment: '{line.strip().decode('utf-8', 'replace')}'", file_path, total_lines)
+        
+        stripped = line.lstrip()
+        if not stripped:
+            blank_lines += 1
+        elif stripped.startswith((b'//', b'/*', b'*')):
+            comment_lines += 1
+    
+    return {'total_lines': total_lines, 'comment_lines': comment_lines, 'blank_lines': blank_lines}
+
+def check_naming_conventions(file_path, newlines, functions, define_matches, report):
     """Check for naming convention violations."""
     issues = []
-    with open(file_path, 'r') as f:
-        content = f.read()
     
     # Check for function names (should be snake_case)
-    function_pattern = r'(\w+)\s+(\w+)\s*\([^)]*\)\s*\{'
-    for match in re.finditer(function_pattern, content):
-        func_name = match.group(2)
-        if not re.match(r'^[a-z][a-z0-9_]*$', func_name) and func_name != 'main':
-            line_num = content[:match.start()].count('\n') + 1
-            print_issue("WARNING", f"Function '{func_name}' should use snake_case", file_path, line_num)
+    for func_name, line_num, _, _ in functions:
+        if not _SNAKE_RE.match(func_name) and func_name != b'main':
+            func_name = func_name.decode()
+            report("WARNING", f"Function '{func_name}' should use snake_case", file_path, line_num)
             issues.append((line_num, func_name))
     
     # Check for constants (should be UPPER_CASE)
-    define_pattern = r'#define\s+([A-Za-z0-9_]+)'
-    for match in re.finditer(define_pattern, content):
-        constant_name = match.group(1)
-        if not re.match(r'^[A-Z][A-Z0-9_]*$', constant_name):
-            line_num = content[:match.start()].count('\n') + 1
-            print_issue("WARNING", f"Constant '{constant_name}' should use UPPER_CASE", file_path, line_num)
+    for match in define_matches:
+        constant_name = match.group('define_name')
+        if not _UPPER_RE.match(constant_name):
+            constant_name = constant_name.decode()
+            line_num = line_of(newlines, match.start())
+            report("WARNING", f"Constant '{constant_name}' should use UPPER_CASE", file_path, line_num)
             issues.append((line_num, constant_name))
     
     return issues
 
-def check_memory_management(file_path):
+def check_memory_management(file_path, content, newlines, malloc_matches, free_matches, report):
     """Check for potential memory management issues."""
     issues = []
-    with open(file_path, 'r') as f:
-        content = f.read()
     
     # Check for malloc without free
-    malloc_pattern = r'(\w+)\s*=\s*malloc\('
-    malloc_vars = []
-    for match in re.finditer(malloc_pattern, content):
-        var_name = match.group(1)
-        malloc_vars.append(var_name)
-    
-    free_pattern = r'free\s*\(\s*(\w+)\s*\)'
-    free_vars = []
-    for match in re.finditer(free_pattern, content):
-        var_name = match.group(1)
-        free_vars.append(var_name)
-    
-    # Simple check for variables that might not be freed
+    malloc_vars = [match.group('malloc_var') for match in malloc_matches]
+    free_vars = {match.group('free_var') for match in free_matches}
+    
+    # Simple check for variables that might not be freed; the content is
+    # searched at most once per distinct variable
+    leaked = {}
     for var in malloc_vars:
-        if var not in free_vars and not (var + '_' in content or '_' + var in content):
-            print_issue("WARNING", f"Potential memory leak: '{var}' allocated but might not be freed", file_path)
+        if var in free_vars:
+            continue
+        if var not in leaked:
+            leaked[var] = content.find(var + b'_') == -1 and content.find(b'_' + var) == -1
+        if leaked[var]:
+            var = var.decode()
+            report("WARNING", f"Potential memory leak: '{var}' allocated but might not be freed", file_path)
             issues.append(var)
     
-    # Check for unchecked malloc
-    unchecked_malloc_pattern = r'(\w+)\s*=\s*malloc\([^;]*;(?!\s*if\s*\(\s*!\s*\1|\s*if\s*\(\s*\1\s*==\s*NULL)'
-    for match in re.finditer(unchecked_malloc_pattern, content):
-        var_name = match.group(1)
-        line_num = content[:match.start()].count('\n') + 1
-        print_issue("ERROR", f"Unchecked malloc of '{var_name}'", file_path, line_num)
+    # Check for unchecked malloc: look at what follows the end of each
+    # malloc statement for a check of the same variable
+    for match in malloc_matches:
+        end_pos = content.find(b';', match.end())
+        if end_pos == -1:
+            continue
+        var_name = match.group('malloc_var')
+        checked = _CHECKED_RE.match(content, end_pos + 1)
+        if checked and var_name in checked.groups():
+            continue
+        var_name = var_name.decode()
+        line_num = line_of(newlines, match.start())
+        report("ERROR", f"Unchecked malloc of '{var_name}'", file_path, line_num)
         issues.append((line_num, var_name))
     
     return issues
 
-def check_error_handling(file_path):
+def check_error_handling(file_path, content, newlines, report):
     """Check for potential issues with error handling."""
     issues = []
-    with open(file_path, 'r') as f:
-        content = f.read()
+    
+    # Skip the full pattern in files that make none of these calls
+    if not _SYSCALL_ANY_RE.search(content):
+        return issues
     
     # Check for system calls without error checking
-    system_calls = ['open', 'close', 'read', 'write', 'fork', 'exec', 'dup', 'dup2']
-    for call in system_calls:
-        pattern = r'(\w+)\s*=\s*{}[^;]*;(?!\s*if\s*\(\s*\1)'.format(call)
-        for match in re.finditer(pattern, content):
-            var_name = match.group(1)
-            line_num = content[:match.start()].count('\n') + 1
-            print_issue("WARNING", f"Unchecked system call: '{call}' result stored in '{var_name}'", file_path, line_num)
-            issues.append((line_num, call, var_name))
+    for match in _SYSCALL_RE.finditer(content):
+        var_name = match.group(1).decode()
+        call = match.group(2).decode()
+        line_num = line_of(newlines, match.start())
+        report("WARNING", f"Unchecked system call: '{call}' result stored in '{var_name}'", file_path, line_num)
+        issues.append((line_num, call, var_name))
     
     return issues
 
-def run_cppcheck(file_path):
-    """Run cppcheck on the file if available."""
+def run_cppcheck(c_files):
+    """Run cppcheck once over all files if available.
+    
+    Returns the reported issues grouped by normalized file path, or None if
+    cppcheck is not installed.
+    """
     try:
-        result = subprocess.run(['cppcheck', '--enable=all', '--suppress=missingIncludeSystem', file_path], 
-                               capture_output=True, text=True)
-        if result.stderr:
-            print_header(f"Cppcheck results for {file_path}")
-            for line in result.stderr.splitlines():
-                if ': error:' in line:
-                    print_issue("ERROR", line.split(': error:')[1], file_path)
-                elif ': warning:' in line:
-                    print_issue("WARNING", line.split(': warning:')[1], file_path)
-                elif ': style:' in line:
-                    print_issue("INFO", line.split(': style:')[1], file_path)
+        result = subprocess.run(['cppcheck', '--enable=all', '--suppress=missingIncludeSystem',
+                                 '-j', str(os.cpu_count() or 1), '--file-list=-'],
+                                input='\n'.join(c_files), capture_output=True, text=True)
     except FileNotFoundError:
-        print("cppcheck not found, skipping static analysis")
+        return None
+    
+    results = defaultdict(list)
+    for line in result.stderr.splitlines():
+        for marker, severity in ((': error:', "ERROR"), (': warning:', "WARNING"), (': style:', "INFO")):
+            if marker in line:
+                # cppcheck simplifies the paths it prints (./a.c becomes a.c),
+                # so results are grouped under the normalized path
+                file_path = os.path.normpath(line.split(':', 1)[0])
+                results[file_path].append((severity, line.split(marker)[1], file_path))
+                break
+    return results
 
-def collect_metrics(file_path):
+def collect_metrics(content, line_counts, functions):
     """Collect various metrics about the code."""
-    with open(file_path, 'r') as f:
-        content = f.read()
-    
-    metrics = {}
-    
-    # Count lines
-    metrics['total_lines'] = content.count('\n') + 1
-    
-    # Count comment lines (simplistic approach)
-    comment_lines = len(re.findall(r'^\s*//.*$|^\s*/\*.*?\*/\s*$|^\s*\*.*$', content, re.MULTILINE))
-    metrics['comment_lines'] = comment_lines
-    
-    # Count blank lines
-    blank_lines = len(re.findall(r'^\s*$', content, re.MULTILINE))
-    metrics['blank_lines'] = blank_lines
+    # Line counts come from the scan_lines() pass
+    metrics = dict(line_counts)
     
     # Count code lines
     metrics['code_lines'] = metrics['total_lines'] - metrics['comment_lines'] - metrics['blank_lines']
     
     # Count functions
-    function_pattern = r'(\w+\s+)+(\w+)\s*\([^)]*\)\s*\{'
-    functions = re.findall(function_pattern, content)
     metrics['function_count'] = len(functions)
     
     # Count variables
-    var_pattern = r'(int|char|float|double|long|short|unsigned|void|bool|size_t)\s+([a-zA-Z_][a-zA-Z0-9_]*)[^(]'
-    variables = re.findall(var_pattern, content)
-    metrics['variable_count'] = len(variables)
+    metrics['variable_count'] = sum(1 for _ in _VAR_RE.finditer(content))
     
     return metrics
 
 def analyze_file(file_path):
-    """Analyze a single file for issues."""
-    print_header(f"Analyzing {file_path}")
+    """Analyze a single file, returning its metrics and the issues found.
     
-    # Run various checks
-    check_file_length(file_path)
-    check_function_length(file_path)
-    check_long_lines(file_path)
-    check_todo_comments(file_path)
-    check_naming_conventions(file_path)
-    check_memory_management(file_path)
-    check_error_handling(file_path)
+    Nothing is printed here so that files can be analyzed in worker processes.
+    """
+    issues = []
+    report = lambda severity, message, file=None, line=None: issues.append((severity, message, file, line))
+    
+    # Map the file once and share it between all checks; matches refer to
+    # the mapping, so everything has to run before it is closed
+    functions = parse_functions(file_path)
+    with map_file(file_path) as content:
+        newlines = line_offsets(content)
+        if functions is None:
+            matches = scan_file(content)
+            functions = find_functions(content, newlines, matches['func'])
+        else:
+            matches = scan_file(content, _COMBINED_NO_FUNC_RE)
+        
+        # Run various checks
+        check_file_length(file_path, count_lines(content, newlines), report)
+        check_function_length(file_path, functions, report)
+        line_counts = scan_lines(file_path, iter_lines(content, newlines), report)
+        check_naming_conventions(file_path, newlines, functions, matches['define'], report)
+        check_memory_management(file_path, content, newlines, matches['malloc'], matches['free'], report)
+        check_error_handling(file_path, content, newlines, report)
+        
+        # Collect metrics
+        metrics = collect_metrics(content, line_counts, functions)
     
-    # Run external tools if available
-    run_cppcheck(file_path)
+    return metrics, issues
+
+def print_file_report(file_path, metrics, issues, cppcheck_issues):
+    """Print the issues and metrics of a single file."""
+    print_header(f"Analyzing {file_path}")
+    for issue in issues:
+        print_issue(*issue)
     
-    # Collect metrics
-    metrics = collect_metrics(file_path)
+    if cppcheck_issues:
+        print_header(f"Cppcheck results for {file_path}")
+        for issue in cppcheck_issues:
+            print_issue(*issue)
     
     print(f"\n{Colors.GREEN}Metrics for {file_path}:{Colors.ENDC}")
     print(f"  Total lines: {metrics['total_lines']}")
@@ -267,8 +433,39 @@ def analyze_file(file_path):
     print(f"  Blank lines: {metrics['blank_lines']}")
     print(f"  Functions: {metrics['function_count']}")
     print(f"  Variables: {metrics['variable_count']}")
-    
-    return metrics
+
+def cache_version():
+    """Return the version tag that cached results must match."""
+    # Functions are found differently with libclang, so whether it actually
+    # loads (not just whether the bindings import) is part of the tag
+    return [_CACHE_VERSION, clang_index() is not None]
+
+def load_cache():
+    """Load the cached results of earlier runs."""
+    try:
+        with open(_CACHE_PATH) as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(cache, dict) or cache.get('version') != cache_version():
+        return {}
+    return cache.get('files', {})
+
+def save_cache(files):
+    """Save the cached results, replacing the file atomically."""
+    tmp_path = f"{_CACHE_PATH}.{os.getpid()}"
+    try:
+        os.makedirs(os.path.dirname(_CACHE_PATH), exist_ok=True)
+        with open(tmp_path, 'w') as f:
+            json.dump({'version': cache_version(), 'files': files}, f)
+        os.replace(tmp_path, _CACHE_PATH)
+    except OSError:
+        print(f"{Colors.YELLOW}Could not write cache {_CACHE_PATH}{Colors.ENDC}")
+
+def file_stamp(file_path):
+    """Return the size and modification time that identify a file's contents."""
+    st = os.stat(file_path)
+    return [st.st_size, st.st_mtime_ns]
 
 def analyze_project(directory):
     """Analyze the entire project."""
@@ -280,15 +477,41 @@ def analyze_project(directory):
     
     print(f"{Colors.GREEN}Found {len(c_files)} C files to analyze{Colors.ENDC}")
     
-    total_metrics = defaultdict(int)
+    # Run external tools if available; one cppcheck run covers every file
+    cppcheck_results = run_cppcheck(c_files)
+    if cppcheck_results is None:
+        print("cppcheck not found, skipping static analysis")
+        cppcheck_results = {}
+    
+    total_metrics = Counter()
     file_metrics = {}
     
-    for file_path in c_files:
-        metrics = analyze_file(file_path)
-        file_metrics[file_path] = metrics
-        
-        for key, value in metrics.items():
-            total_metrics[key] += value
+    # Reuse the results of files that are unchanged since the last run
+    cache = load_cache()
+    stamps = {file_path: file_stamp(file_path) for file_path in c_files}
+    stale_files = [file_path for file_path in c_files
+                   if cache.get(os.path.abspath(file_path), [None])[0] != stamps[file_path]]
+    
+    # Files are independent, so analyze them in parallel and report in order
+    with ProcessPoolExecutor() as executor:
+        results = executor.map(analyze_file, stale_files, chunksize=8)
+        for file_path in c_files:
+            key = os.path.abspath(file_path)
+            if cache.get(key, [None])[0] == stamps[file_path]:
+                _, metrics, issues = cache[key]
+                issues = [(severity, message, file_path, line) for severity, message, line in issues]
+            else:
+                metrics, issues = next(results)
+                # The path is stored once in the key rather than in every issue
+                cache[key] = [stamps[file_path], metrics,
+                              [(severity, message, line) for severity, message, _, line in issues]]
+            
+            print_file_report(file_path, metrics, issues, cppcheck_results.get(os.path.normpath(file_path)))
+            file_metrics[file_path] = metrics
+            total_metrics.update(metrics)
+    
+    if stale_files:
+        save_cache(cache)
     
     print_header("Project Summary")
     print(f"Total files: {len(c_files)}")
@@ -299,8 +522,8 @@ def analyze_project(directory):
     
     # Find files with the most code
     print_header("Files with the most code")
-    sorted_files = sorted(file_metrics.items(), key=lambda x: x[1]['code_lines'], reverse=True)
-    for file_path, metrics in sorted_files[:5]:
+    largest_files = heapq.nlargest(5, file_metrics.items(), key=lambda x: x[1]['code_lines'])
+    for file_path, metrics in largest_files:
         print(f"{file_path}: {metrics['code_lines']} lines of code, {metrics['function_count']} functions")
 
 def main():